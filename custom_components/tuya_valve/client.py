@@ -8,45 +8,124 @@ This module implements just enough of Tuya's Cloud API to:
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import hmac
-import json
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 import uuid
 
-import requests
+import aiohttp
+import orjson
 
-from .const import PROP_GET_STATE_TOTAL, PROP_MAIN_SWITCH, PROP_STATE_LIST
+try:
+    from homeassistant.helpers.aiohttp_client import async_get_clientsession
+except ImportError:  # standalone use outside Home Assistant (see test.py)
+    async_get_clientsession = None
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+    from homeassistant.helpers.storage import Store
+
+from .const import (
+    DEFAULT_SCAN_SEC,
+    PROP_GET_STATE_TOTAL,
+    PROP_MAIN_SWITCH,
+    PROP_STATE_LIST,
+)
+
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20)
 
 
 class TuyaValveClient:
     """Minimal Tuya cloud client for this valve (v2 canonical signing only)."""
 
-    def __init__(self, base: str, client_id: str, client_secret: str, device_id: str) -> None:
-        """Initialize the client with endpoint, credentials, and target device id."""
+    def __init__(
+        self,
+        hass: HomeAssistant | None,
+        base: str,
+        client_id: str,
+        client_secret: str,
+        device_id: str,
+        scan_interval: int = DEFAULT_SCAN_SEC,
+        token_store: Store | None = None,
+        preloaded_token: dict[str, Any] | None = None,
+    ) -> None:
+        """Initialize the client with endpoint, credentials, and target device id.
+
+        ``scan_interval`` (seconds) doubles as the freshness threshold for
+        shadow reads: values younger than one interval are served without
+        asking the device to republish.
+
+        Inside Home Assistant the shared aiohttp session is used (one pooled
+        keep-alive connection to the Tuya endpoint). With ``hass=None`` the
+        client lazily owns a small pooled session instead; call
+        :meth:`async_close` when done with a standalone client.
+        """
+        self._hass = hass
         self.base = base.rstrip("/")
         self.client_id = client_id
         self.client_secret = client_secret
         self.device_id = device_id
+        self._scan_interval_ms = scan_interval * 1000
+        self._client_id_b = client_id.encode("utf-8")
+        self._client_secret_b = client_secret.encode("utf-8")
+        self._session = async_get_clientsession(hass) if hass is not None else None
+        self._owns_session = hass is None
+        self._token_store = token_store
         self._token_cache: dict[str, Any] = {"access_token": None, "ts": 0.0, "ttl": 0}
+        self._meta_cache: dict[str, Any] | None = None
+        if preloaded_token:
+            self._seed_token(preloaded_token)
+
+    def _seed_token(self, saved: dict[str, Any]) -> None:
+        """Adopt a persisted token if its wall-clock age says it is alive.
+
+        The saved record carries a wall timestamp; the in-process cache ages
+        on the monotonic clock, so the wall age is translated into the
+        monotonic timebase. Records from the future (clock stepped back) are
+        rejected rather than trusted.
+        """
+        token = saved.get("access_token")
+        wall = saved.get("wall", 0.0)
+        ttl = saved.get("ttl", 0)
+        age = time.time() - wall
+        if token and 0 <= age < max(1, ttl - 60):
+            self._token_cache.update(access_token=token, ts=time.monotonic() - age, ttl=ttl)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared (or lazily created owned) aiohttp session."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=2, keepalive_timeout=75)
+            )
+        return self._session
+
+    async def async_close(self) -> None:
+        """Close the session if this client owns it (standalone use only)."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
 
     # ----- signing helpers -----
     def _now_ms(self) -> str:
         """Return the current timestamp in milliseconds as a string."""
-        return str(int(time.time() * 1000))
+        return str(time.time_ns() // 1_000_000)
 
-    def _sha256_hex(self, s: str) -> str:
-        """Return the SHA256 hex digest of a string (empty-string safe)."""
-        return hashlib.sha256((s or "").encode("utf-8")).hexdigest()
+    def _sha256_hex(self, b: bytes) -> str:
+        """Return the SHA256 hex digest of a bytes body (empty-body safe)."""
+        return hashlib.sha256(b or b"").hexdigest()
 
-    def _hmac_hex(self, key: str, msg: str) -> str:
-        """Return the uppercased HMAC-SHA256 hex digest for (key, msg)."""
-        return hmac.new(key.encode("utf-8"), msg.encode("utf-8"), hashlib.sha256).hexdigest().upper()
+    def _hmac_hex(self, msg: bytes) -> str:
+        """Return the uppercased HMAC-SHA256 hex digest keyed by the secret.
+
+        hmac.digest takes the one-shot C path straight into OpenSSL, which
+        dispatches to SHA-NI/AVX2 where the hardware supports it.
+        """
+        return hmac.digest(self._client_secret_b, msg, "sha256").hex().upper()
 
     # ----- v2 canonical request -----
-    def _req_v2(
+    async def _req_v2(
         self,
         method: str,
         path_with_query: str,
@@ -54,11 +133,18 @@ class TuyaValveClient:
         need_token: bool = True,
     ) -> dict[str, Any]:
         """Perform a signed Tuya v2 request and return JSON (or a small error dict)."""
-        body = "" if body_obj is None else json.dumps(body_obj, ensure_ascii=False, separators=(",", ":"))
+        # orjson emits compact UTF-8 bytes; no separators/ensure_ascii dance
+        body = b"" if body_obj is None else orjson.dumps(body_obj)
         t = self._now_ms()
         nonce = uuid.uuid4().hex
         bodyhash = self._sha256_hex(body)
-        sts = f"{method}\n{bodyhash}\n\n{path_with_query}"
+        # Canonical string-to-sign assembled as bytes: one join, no
+        # intermediate str concatenations or double UTF-8 encoding.
+        sts_b = b"%s\n%s\n\n%s" % (
+            method.encode("utf-8"),
+            bodyhash.encode("ascii"),
+            path_with_query.encode("utf-8"),
+        )
 
         headers = {
             "client_id": self.client_id,
@@ -70,62 +156,79 @@ class TuyaValveClient:
         }
 
         if need_token:
-            at = self._access_token()
+            at = await self._access_token()
             headers["access_token"] = at
-            sign_str = self.client_id + at + t + nonce + sts
+            sign_src = b"".join(
+                (self._client_id_b, at.encode("utf-8"), t.encode("ascii"), nonce.encode("ascii"), sts_b)
+            )
         else:
-            sign_str = self.client_id + t + nonce + sts
+            sign_src = b"".join(
+                (self._client_id_b, t.encode("ascii"), nonce.encode("ascii"), sts_b)
+            )
 
-        headers["sign"] = self._hmac_hex(self.client_secret, sign_str)
+        headers["sign"] = self._hmac_hex(sign_src)
 
+        session = self._get_session()
         try:
-            resp = requests.request(
+            async with session.request(
                 method,
                 f"{self.base}{path_with_query}",
                 headers=headers,
                 data=body,
-                timeout=20,
-            )
-        except requests.RequestException as exc:
+                timeout=REQUEST_TIMEOUT,
+            ) as resp:
+                try:
+                    return await resp.json(content_type=None)
+                except ValueError:
+                    # Non-JSON body; return minimal context for debugging
+                    return {"success": False, "http_status": resp.status, "text": await resp.text()}
+        except (aiohttp.ClientError, TimeoutError) as exc:
             # Network/transport error
             return {"success": False, "error": "request_exception", "message": str(exc)}
 
-        try:
-            return resp.json()
-        except ValueError:
-            # Non-JSON body; return minimal context for debugging
-            return {"success": False, "http_status": resp.status_code, "text": resp.text}
-
-    def _token_v2(self) -> dict[str, Any]:
+    async def _token_v2(self) -> dict[str, Any]:
         """Request a new project token (no access_token in the signature)."""
-        return self._req_v2("GET", "/v1.0/token?grant_type=1", None, need_token=False)
+        return await self._req_v2("GET", "/v1.0/token?grant_type=1", None, need_token=False)
 
-    def _access_token(self) -> str:
+    async def _access_token(self) -> str:
         """Return a cached access token, refreshing when near expiry."""
-        now = time.time()
+        # Monotonic clock for the age check: only the delta matters, and a
+        # wall-clock jump (NTP step, DST) must not invalidate a live token.
+        now = time.monotonic()
         if self._token_cache["access_token"] and (now - self._token_cache["ts"] < max(1, self._token_cache["ttl"] - 60)):
             return self._token_cache["access_token"]
-        j = self._token_v2()
+        j = await self._token_v2()
         if not j.get("success"):
             raise RuntimeError(f"Tuya token error: {j}")
         res = j["result"]
         self._token_cache.update(access_token=res["access_token"], ts=now, ttl=res.get("expire_time", 3600))
+        if self._token_store is not None and self._hass is not None:
+            # Persist off the hot path so reloads/restarts skip this refresh
+            self._hass.async_create_task(
+                self._token_store.async_save(
+                    {
+                        "access_token": res["access_token"],
+                        "wall": time.time(),
+                        "ttl": self._token_cache["ttl"],
+                    }
+                )
+            )
         return res["access_token"]
 
     # ----- Things endpoints we actually use -----
-    def _props_issue(self, props: dict[str, Any]) -> dict[str, Any]:
+    async def _props_issue(self, props: dict[str, Any]) -> dict[str, Any]:
         """Issue thing-shadow properties to the device."""
-        body = {"properties": json.dumps(props, ensure_ascii=False, separators=(",", ":"))}
-        return self._req_v2(
+        body = {"properties": orjson.dumps(props).decode()}
+        return await self._req_v2(
             "POST",
             f"/v2.0/cloud/thing/{self.device_id}/shadow/properties/issue",
             body,
             need_token=True,
         )
 
-    def _props_query(self, codes: list[str]) -> dict[str, Any]:
+    async def _props_query(self, codes: list[str]) -> dict[str, Any]:
         """Query thing-shadow properties by code list."""
-        return self._req_v2(
+        return await self._req_v2(
             "GET",
             f"/v2.0/cloud/thing/{self.device_id}/shadow/properties?codes={','.join(codes)}",
             None,
@@ -133,53 +236,101 @@ class TuyaValveClient:
         )
 
     # ----- Device metadata (one-shot) -----
-    def device_meta(self) -> dict[str, Any] | None:
-        """Return Tuya device metadata (name, mac, sn, product info...), or None."""
-        j = self._req_v2("GET", f"/v1.0/iot-03/devices/{self.device_id}")
+    async def device_meta(self) -> dict[str, Any] | None:
+        """Return Tuya device metadata (name, mac, sn, product info...), or None.
+
+        Metadata is static for the lifetime of a client, so the first
+        successful fetch is memoized; setup paths that ask twice (validate +
+        entry title + device_info) cost a single HTTP call.
+        """
+        if self._meta_cache is not None:
+            return self._meta_cache
+        j = await self._req_v2("GET", f"/v1.0/iot-03/devices/{self.device_id}")
         if isinstance(j, dict) and j.get("success") and isinstance(j.get("result"), dict):
-            return j["result"]
+            self._meta_cache = j["result"]
+            return self._meta_cache
         return None
 
-    def device_name(self) -> str | None:
+    async def device_name(self) -> str | None:
         """Convenience accessor for the device display name."""
-        meta = self.device_meta()
+        meta = await self.device_meta()
         return meta.get("name") if meta else None
 
     # ----- Valve ops -----
     def _b64_obj(self, o: dict[str, Any]) -> str:
         """Encode a JSON-serializable object as Base64(JSON)."""
-        return base64.b64encode(json.dumps(o, separators=(",", ":")).encode()).decode()
+        return base64.b64encode(orjson.dumps(o)).decode()
 
-    def state(self) -> bool | None:
-        """Return True=flow open, False=closed, or None if unknown."""
-        self._props_issue({PROP_GET_STATE_TOTAL: True})
-        time.sleep(0.8)
-        j = self._props_query([PROP_STATE_LIST])
+    def _decode_state(self, j: dict[str, Any]) -> bool | None:
+        """Decode a shadow query response into True=open/False=closed/None."""
         try:
             prop = (j.get("result") or {}).get("properties", [])[0]
-            decoded = json.loads(base64.b64decode(prop["value"]).decode())
+            decoded = orjson.loads(base64.b64decode(prop["value"]))
             return bool(decoded["valve_state_list"]["valvestatelist"][0])
         except (IndexError, KeyError, ValueError, TypeError):
             return None
 
-    def turn_on(self) -> bool:
-        """Open the valve; return True on success (confirmed by readback)."""
-        self._props_issue({PROP_MAIN_SWITCH: self._b64_obj({"totalswitch": True})})
-        time.sleep(0.8)
-        return self.state() is True
+    def _prop_time_ms(self, j: dict[str, Any]) -> int:
+        """Return the shadow property timestamp in ms, or 0 if unavailable."""
+        try:
+            return int((j.get("result") or {}).get("properties", [])[0].get("time") or 0)
+        except (IndexError, AttributeError, TypeError, ValueError):
+            return 0
+
+    async def _query_state_since(self, since_ms: int) -> bool | None:
+        """Poll the shadow until its timestamp advances past ``since_ms``.
+
+        Replaces the old blind 0.8 s wait with a short backoff ladder: most
+        reads complete after the first 150 ms delay. If the timestamp never
+        advances we still return the last decoded value (a stale reading
+        beats no reading; the next coordinator poll reconciles).
+        """
+        j: dict[str, Any] = {}
+        for delay in (0.15, 0.25, 0.4):
+            await asyncio.sleep(delay)
+            j = await self._props_query([PROP_STATE_LIST])
+            if self._prop_time_ms(j) > since_ms:
+                break
+        return self._decode_state(j)
+
+    async def state(self) -> bool | None:
+        """Return True=flow open, False=closed, or None if unknown.
+
+        Fast path: the shadow usually holds a recent value, so a single
+        query suffices. Only when the stored value is older than one scan
+        interval do we fall back to the issue-and-poll refresh.
+        """
+        j = await self._props_query([PROP_STATE_LIST])
+        prop_time = self._prop_time_ms(j)
+        if prop_time and int(self._now_ms()) - prop_time < self._scan_interval_ms:
+            return self._decode_state(j)
+        since = int(self._now_ms())
+        await self._props_issue({PROP_GET_STATE_TOTAL: True})
+        return await self._query_state_since(since)
+
+    async def turn_on(self) -> bool:
+        """Open the valve; return True on success (confirmed by readback).
+
+        The shadow already reflects the new state once the device ACKs the
+        issue, so the readback is a single query - no extra
+        get_valve_state_total issue round-trip.
+        """
+        since = int(self._now_ms())
+        await self._props_issue({PROP_MAIN_SWITCH: self._b64_obj({"totalswitch": True})})
+        return await self._query_state_since(since) is True
 
-    def turn_off(self) -> bool:
+    async def turn_off(self) -> bool:
         """Close the valve; return True on success (confirmed by readback)."""
-        self._props_issue({PROP_MAIN_SWITCH: self._b64_obj({"totalswitch": False})})
-        time.sleep(0.8)
-        return self.state() is False
+        since = int(self._now_ms())
+        await self._props_issue({PROP_MAIN_SWITCH: self._b64_obj({"totalswitch": False})})
+        return await self._query_state_since(since) is False
 
-    def validate(self) -> bool:
+    async def validate(self) -> bool:
         """Lightweight credential/device check used by the config flow."""
         try:
-            self._access_token()
-            self.state()
-        except (requests.RequestException, RuntimeError, ValueError, KeyError, TypeError):
+            await self._access_token()
+            await self.state()
+        except (aiohttp.ClientError, RuntimeError, ValueError, KeyError, TypeError):
             return False
         else:
             return True
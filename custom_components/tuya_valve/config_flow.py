@@ -32,17 +32,18 @@ class TuyaValveConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             client = TuyaValveClient(
+                self.hass,
                 base=user_input[CONF_BASE_URL],
                 client_id=user_input[CONF_CLIENT_ID],
                 client_secret=user_input[CONF_CLIENT_SECRET],
                 device_id=user_input[CONF_DEVICE_ID],
             )
-            ok = await self.hass.async_add_executor_job(client.validate)
+            ok = await client.validate()
             if not ok:
                 errors["base"] = "auth_failed"
             else:
                 # Fetch device name for entry title
-                name = await self.hass.async_add_executor_job(client.device_name)
+                name = await client.device_name()
                 title = name or f"Tuya Valve ({user_input[CONF_DEVICE_ID][-6:]})"
 
                 await self.async_set_unique_id(user_input[CONF_DEVICE_ID])
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 from datetime import timedelta
 import logging
+import time
 
 from homeassistant.components.valve import (
     ValveDeviceClass,
@@ -17,9 +18,11 @@ from homeassistant.components.valve import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import (
     CONNECTION_NETWORK_MAC,  # for MAC in device_info
 )
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
@@ -37,6 +40,56 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Scheduled polls inside this window after a command are skipped; the
+# command path already read the state back.
+COMMAND_GRACE_SEC = 2.0
+# Cap the back-off at 10x the configured scan interval.
+MAX_BACKOFF_MULT = 10
+
+
+class TuyaValveCoordinator(DataUpdateCoordinator):
+    """Polling coordinator with command-aware skipping and stale back-off."""
+
+    def __init__(self, hass: HomeAssistant, client: TuyaValveClient, scan_sec: int) -> None:
+        """Build the coordinator around the client with a debounced refresh."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_coordinator",
+            update_interval=timedelta(seconds=scan_sec),
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=1.0, immediate=False
+            ),
+        )
+        self._client = client
+        self._base_interval = timedelta(seconds=scan_sec)
+        self._none_streak = 0
+        self._last_command = 0.0
+
+    def note_command(self) -> None:
+        """Record a valve command so the next scheduled poll can be skipped."""
+        self._last_command = time.monotonic()
+
+    def clear_command_grace(self) -> None:
+        """Allow polling again immediately (e.g. readback was inconclusive)."""
+        self._last_command = 0.0
+
+    async def _async_update_data(self):
+        """Poll valve state, backing off while the device stays unreachable."""
+        if time.monotonic() - self._last_command < COMMAND_GRACE_SEC:
+            # The command path just read the state back; don't burn quota.
+            return self.data
+        state = await self._client.state()
+        if state is None:
+            self._none_streak += 1
+            if self._none_streak >= 2:
+                mult = min(2 ** (self._none_streak - 1), MAX_BACKOFF_MULT)
+                self.update_interval = self._base_interval * mult
+        elif self._none_streak:
+            self._none_streak = 0
+            self.update_interval = self._base_interval
+        return state
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
@@ -48,31 +101,30 @@ async def async_setup_entry(
     """
     data = entry.data
 
+    scan_sec = entry.options.get("scan_interval", DEFAULT_SCAN_SEC)
+
+    # Tuya tokens live ~2 h; persist them so a reload/restart inside that
+    # window skips the token round-trip entirely.
+    token_store = Store(hass, 1, f"{DOMAIN}_{data[CONF_DEVICE_ID]}_token")
+    saved_token = await token_store.async_load()
+
     client = TuyaValveClient(
+        hass,
         base=data[CONF_BASE_URL],
         client_id=data[CONF_CLIENT_ID],
         client_secret=data[CONF_CLIENT_SECRET],
         device_id=data[CONF_DEVICE_ID],
+        scan_interval=scan_sec,
+        token_store=token_store,
+        preloaded_token=saved_token,
     )
 
     # One-shot metadata fetch (no periodic polling)
-    meta = await hass.async_add_executor_job(client.device_meta)
+    meta = await client.device_meta()
     # Prefer cloud name if present; otherwise fall back to entry title
     friendly_name = (meta or {}).get("name") or entry.title
 
-    async def _async_update():
-        """Return current valve state: True=open, False=closed, None=unknown."""
-        return await hass.async_add_executor_job(client.state)
-
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name=f"{DOMAIN}_coordinator",
-        update_method=_async_update,
-        update_interval=timedelta(
-            seconds=entry.options.get("scan_interval", DEFAULT_SCAN_SEC)
-        ),
-    )
+    coordinator = TuyaValveCoordinator(hass, client, scan_sec)
 
     await coordinator.async_config_entry_first_refresh()
     async_add_entities(
@@ -90,7 +142,7 @@ class TuyaValveEntity(CoordinatorEntity, ValveEntity):
     def __init__(
         self,
         client: TuyaValveClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: TuyaValveCoordinator,
         name: str,
         device_id: str,
         meta: dict | None,
@@ -150,13 +202,20 @@ class TuyaValveEntity(CoordinatorEntity, ValveEntity):
         }
 
     async def async_open_valve(self) -> None:
-        """Command the valve to open, then refresh state."""
-        ok = await self.hass.async_add_executor_job(self._client.turn_on)
-        if ok:
+        """Command the valve to open and push the confirmed state."""
+        self.coordinator.note_command()
+        if await self._client.turn_on():
+            # Readback confirmed open; no need to poll again.
+            self.coordinator.async_set_updated_data(True)
+        else:
+            self.coordinator.clear_command_grace()
             await self.coordinator.async_request_refresh()
 
     async def async_close_valve(self) -> None:
-        """Command the valve to close, then refresh state."""
-        ok = await self.hass.async_add_executor_job(self._client.turn_off)
-        if ok:
+        """Command the valve to close and push the confirmed state."""
+        self.coordinator.note_command()
+        if await self._client.turn_off():
+            self.coordinator.async_set_updated_data(False)
+        else:
+            self.coordinator.clear_command_grace()
             await self.coordinator.async_request_refresh()